@@ -1,86 +1,131 @@
-from typing import List, Tuple, Optional
+import atexit
+import io
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import Dict, List, Tuple, Optional
 from urllib.parse import urlparse
 
 import click
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 from typings import DatabaseKeyRecord
 
+# Batches below this size are inserted with a single unnest() INSERT;
+# larger batches are streamed with COPY FROM STDIN to avoid per-row
+# parsing overhead.
+COPY_MIN_ROWS = 500
+
+# COPY text format requires backslash, tab and newline escaping.
+_COPY_ESCAPE = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+)
+
+_RECORD_FIELDS = itemgetter(
+    "public_key", "private_key", "nonce", "validator_index", "fee_recipient"
+)
+
 
 class Database:
     def __init__(self, db_url: str, table_name: str = "keys"):
         self.db_url = db_url
         self.table_name = table_name
+        # Memoized result of the fee_recipient column check, None until probed
+        self._fee_recipient_exists: Optional[bool] = None
+
+    def check_connection(self) -> None:
+        """
+        Verifies connectivity and warms the shared connection pool, so the
+        queries that follow reuse the connection opened here.
+        """
+        check_db_connection(self.db_url)
 
     def update_keys(self, keys: List[DatabaseKeyRecord]) -> None:
         """Updates database records to new state."""
         with _get_db_connection(self.db_url) as conn:
             with conn.cursor() as cur:
-                # recreate table
+                # empty the table without dropping it: TRUNCATE keeps the
+                # table OID, indexes and statistics, and the whole run is
+                # one transaction so the old keys survive a failed load.
+                # ALTER TABLE upgrades legacy tables created before the
+                # fee_recipient column existed, which CREATE TABLE IF NOT
+                # EXISTS alone would leave untouched
                 cur.execute(
                     sql.SQL("""
-                    DROP TABLE IF EXISTS {table};
-                    CREATE TABLE {table} (
+                    CREATE TABLE IF NOT EXISTS {table} (
                         public_key TEXT UNIQUE NOT NULL,
                         private_key TEXT UNIQUE NOT NULL,
                         nonce TEXT NOT NULL,
                         validator_index TEXT NOT NULL,
-                        fee_recipient TEXT)
+                        fee_recipient TEXT);
+                    ALTER TABLE {table} ADD COLUMN IF NOT EXISTS fee_recipient TEXT;
+                    TRUNCATE {table} RESTART IDENTITY
                     ;""").format(table=sql.Identifier(self.table_name))
                 )
 
-                # insert keys
-                execute_values(
-                    cur,
-                    sql.SQL(
-                        "INSERT INTO {table} (public_key, private_key, nonce, validator_index, fee_recipient) VALUES %s"
-                    ).format(table=sql.Identifier(self.table_name)),
-                    [
+                # insert keys: COPY streams all rows in a single statement,
+                # the unnest() form stays as the fallback for small batches
+                # (one parameterized statement, planned once)
+                if len(keys) >= COPY_MIN_ROWS:
+                    cur.copy_expert(
+                        sql.SQL(
+                            "COPY {table} (public_key, private_key, nonce, validator_index, fee_recipient) FROM STDIN WITH (FORMAT text)"
+                        ).format(table=sql.Identifier(self.table_name)),
+                        _copy_buffer(keys),
+                    )
+                elif keys:
+                    # single pass over the records; the C-level itemgetter
+                    # avoids five separate comprehensions
+                    public_keys, private_keys, nonces, validator_indexes, fee_recipients = (
+                        map(list, zip(*map(_RECORD_FIELDS, keys)))
+                    )
+                    validator_indexes = [str(index) for index in validator_indexes]
+                    cur.execute(
+                        sql.SQL(
+                            "INSERT INTO {table} (public_key, private_key, nonce, validator_index, fee_recipient) "
+                            "SELECT * FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::text[])"
+                        ).format(table=sql.Identifier(self.table_name)),
                         (
-                            x["public_key"],
-                            x["private_key"],
-                            x["nonce"],
-                            x["validator_index"],
-                            x["fee_recipient"],
-                        )
-                        for x in keys
-                    ],
-                )
+                            public_keys,
+                            private_keys,
+                            nonces,
+                            validator_indexes,
+                            fee_recipients,
+                        ),
+                    )
 
     def fetch_public_keys_by_validator_index(
         self, validator_index: str
     ) -> List[Tuple[str, Optional[str]]]:
         with _get_db_connection(self.db_url) as conn:
             with conn.cursor() as cur:
-                # Check if the fee_recipient column exists
-                cur.execute(
-                    sql.SQL("""
-                    SELECT column_name
-                    FROM information_schema.columns
-                    WHERE table_name=%s AND column_name='fee_recipient';
-                """),
-                    (self.table_name,),
-                )
-                fee_recipient_exists = cur.fetchone() is not None
-                if fee_recipient_exists:
-                    # If the fee_recipient column exists, include it in the query
-                    cur.execute(
-                        sql.SQL("""
-                        SELECT public_key, fee_recipient
-                        FROM {table}
-                        WHERE validator_index = %s;
-                    """).format(table=sql.Identifier(self.table_name)),
-                        (validator_index,),
-                    )
-                else:
-                    # If the fee_recipient column does not exist, query only public_key
+                # Try the fee_recipient query directly: a legacy schema
+                # without the column raises UndefinedColumn exactly once,
+                # which is memoized, so the happy path is one round-trip
+                if self._fee_recipient_exists is not False:
+                    try:
+                        cur.execute(
+                            sql.SQL("""
+                            SELECT public_key, fee_recipient
+                            FROM {table}
+                            WHERE validator_index = %s
+                            ORDER BY public_key;
+                        """).format(table=sql.Identifier(self.table_name)),
+                            (validator_index,),
+                        )
+                        self._fee_recipient_exists = True
+                    except psycopg2.errors.UndefinedColumn:
+                        conn.rollback()
+                        self._fee_recipient_exists = False
+                if self._fee_recipient_exists is False:
+                    # Legacy table without fee_recipient, query only public_key
                     cur.execute(
                         sql.SQL("""
                         SELECT public_key, NULL AS fee_recipient
                         FROM {table}
-                        WHERE validator_index = %s;
+                        WHERE validator_index = %s
+                        ORDER BY public_key;
                     """).format(table=sql.Identifier(self.table_name)),
                         (validator_index,),
                     )
@@ -90,13 +135,15 @@ class Database:
 
     def fetch_keys(self) -> List[DatabaseKeyRecord]:
         with _get_db_connection(self.db_url) as conn:
-            with conn.cursor() as cur:
+            # a named (server-side) cursor streams rows in itersize batches
+            # instead of buffering the whole table client-side
+            with conn.cursor(name="fetch_keys_cursor") as cur:
+                cur.itersize = 2000
                 cur.execute(
-                    sql.SQL("SELECT * FROM {table}").format(
-                        table=sql.Identifier(self.table_name)
-                    )
+                    sql.SQL(
+                        "SELECT public_key, private_key, nonce, validator_index, fee_recipient FROM {table}"
+                    ).format(table=sql.Identifier(self.table_name))
                 )
-                rows = cur.fetchall()
                 return [
                     DatabaseKeyRecord(
                         public_key=row[0],
@@ -105,27 +152,99 @@ class Database:
                         validator_index=row[3],
                         fee_recipient=row[4],
                     )
-                    for row in rows
+                    for row in cur
                 ]
 
 
+def _copy_buffer(keys: List[DatabaseKeyRecord]) -> io.StringIO:
+    """Serializes key records into a COPY text-format buffer."""
+    buf = io.StringIO()
+    for x in keys:
+        buf.write(
+            "\t".join(
+                (
+                    str(x["public_key"]).translate(_COPY_ESCAPE),
+                    str(x["private_key"]).translate(_COPY_ESCAPE),
+                    str(x["nonce"]).translate(_COPY_ESCAPE),
+                    str(x["validator_index"]),
+                    "\\N"
+                    if x["fee_recipient"] is None
+                    else str(x["fee_recipient"]).translate(_COPY_ESCAPE),
+                )
+            )
+            + "\n"
+        )
+    buf.seek(0)
+    return buf
+
+
 def check_db_connection(db_url):
-    connection = _get_db_connection(db_url=db_url)
     try:
-        cur = connection.cursor()
-        cur.execute("SELECT 1")
+        with _get_db_connection(db_url=db_url) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
     except psycopg2.OperationalError as e:
         raise click.ClickException(
             f"Error: failed to connect to the database server with provided URL. Error details: {e}",
         )
 
 
+# Lazily created on first use so every caller reuses the same connections
+# instead of paying a fresh TCP/SSL/auth handshake per query. Keyed by
+# url so separate Database instances never share the wrong server.
+_POOLS: Dict[str, ThreadedConnectionPool] = {}
+
+
+def _close_db_pools() -> None:
+    for pool in _POOLS.values():
+        pool.closeall()
+    _POOLS.clear()
+
+
+atexit.register(_close_db_pools)
+
+
+@contextmanager
 def _get_db_connection(db_url):
-    result = urlparse(db_url)
-    return psycopg2.connect(
-        database=result.path[1:],
-        user=result.username,
-        password=result.password,
-        host=result.hostname,
-        port=result.port,
-    )
+    pool = _POOLS.get(db_url)
+    if pool is None:
+        result = urlparse(db_url)
+        pool = _POOLS[db_url] = ThreadedConnectionPool(
+            minconn=1,
+            maxconn=4,
+            database=result.path[1:],
+            user=result.username,
+            password=result.password,
+            host=result.hostname,
+            port=result.port,
+        )
+    conn = _checkout_live_connection(pool)
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def _checkout_live_connection(pool):
+    """
+    Returns a pooled connection that is verified to be alive.
+
+    A pooled socket can sit idle for a long time between the interactive
+    phases of the CLI, and NAT/k8s idle timeouts drop it silently. Probe
+    each checkout and replace dead connections; getconn raises on its
+    own if a fresh dial fails, so this cannot loop forever.
+    """
+    while True:
+        conn = pool.getconn()
+        try:
+            if not conn.closed:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                return conn
+        except psycopg2.Error:
+            pass
+        pool.putconn(conn, close=True)
@@ -1,4 +1,5 @@
 from functools import cached_property
+from typing import Iterable, Iterator, Tuple
 
 from Crypto.Cipher import AES  # nosec B413
 from Crypto.Random import get_random_bytes  # nosec B413
@@ -38,5 +39,18 @@ class Encoder:
         encrypted_data = cipher.encrypt(bytes(data, "ascii"))
         return encrypted_data, cipher.nonce
 
+    def encrypt_many(self, values: Iterable[str]) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Encrypts a stream of values with the shared cipher key.
+
+        EAX needs a fresh cipher per message so each nonce stays unique;
+        the key and constructor lookups are hoisted out of the loop.
+        """
+        new_cipher = AES.new
+        cipher_key = self.cipher_key
+        for value in values:
+            cipher = new_cipher(cipher_key, AES.MODE_EAX)
+            yield cipher.encrypt(bytes(value, "ascii")), cipher.nonce
+
     def _generate_cipher(self) -> AES.MODE_EAX:
         return AES.new(self.cipher_key, AES.MODE_EAX)
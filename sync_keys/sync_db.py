@@ -1,20 +1,165 @@
+import functools
 import os
 import sys
 import math
 
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 import click
-import glob
 from eth_typing import HexStr
 from eth_utils import is_address
 
-from database import Database, check_db_connection
+from database import Database
 from validators import validate_db_uri
 from web3signer import Web3SignerManager
 from typings import DBKeyInfo
 
 from ethstaker_deposit.key_handling.keystore import Keystore
+from ethstaker_deposit.utils.crypto import AES_128_CTR, SHA256
+
+# Derived KDF keys per (kdf function, params, password), local to each
+# worker process. Keystores generated by one keygen run share KDF
+# parameters (including the salt), so the expensive scrypt/PBKDF2 call
+# only has to run once per parameter set.
+_KDF_KEYS: Dict[tuple, bytes] = {}
+
+# keystore*.json, reduced to C-level prefix/suffix checks
+_KEYSTORE_PREFIX = "keystore"
+_KEYSTORE_SUFFIX = ".json"
+
+
+def _keystore_decrypt(keystore: Keystore, password: str) -> bytes:
+    """
+    Mirrors Keystore.decrypt but memoizes the derived KDF key.
+    """
+    crypto = keystore.crypto
+    cache_key = (
+        crypto.kdf.function,
+        tuple(sorted(crypto.kdf.params.items())),
+        password,
+    )
+    decryption_key = _KDF_KEYS.get(cache_key)
+    if decryption_key is None:
+        decryption_key = keystore.kdf(
+            password=keystore._process_password(password), **crypto.kdf.params
+        )
+        _KDF_KEYS[cache_key] = decryption_key
+    if SHA256(decryption_key[16:32] + crypto.cipher.message) != crypto.checksum.message:
+        raise ValueError("Checksum message error")
+    cipher = AES_128_CTR(key=decryption_key[:16], **crypto.cipher.params)
+    return cipher.decrypt(crypto.cipher.message)
+
+
+def _decrypt_keystore(
+    filename: str, password: str
+) -> Tuple[str, Optional[HexStr], Optional[HexStr]]:
+    """
+    Decrypts a single keystore file.
+
+    Runs in a worker process, so it must stay a top-level function.
+    Returns (filename, None, None) when the password does not match.
+    The secret is kept as hex — decimal-izing the 32-byte integer just
+    to stringify it again later is wasted work.
+    """
+    keystore = Keystore.from_file(filename)
+    try:
+        secret_bytes = _keystore_decrypt(keystore, password)
+    except Exception:
+        return filename, None, None
+    return (
+        filename,
+        HexStr("0x" + keystore.pubkey),
+        HexStr("0x" + secret_bytes.hex()),
+    )
+
+
+def _collect_keystores(
+    private_keys_dir: str,
+) -> List[Tuple[Optional[str], str, List[str]]]:
+    """
+    Walks the keys directory once with os.scandir.
+
+    Returns (fee_recipient, directory, keyfiles) groups: the top-level
+    directory first with no specific fee recipient, then every directory
+    whose name is an Ethereum address, which becomes the fee recipient
+    for the keystores it contains.
+    """
+    groups: List[Tuple[Optional[str], str, List[str]]] = []
+
+    def _scan(path: str, fee_recipient: Optional[str], collect_files: bool) -> None:
+        keyfiles = []
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(entry)
+                elif (
+                    collect_files
+                    and entry.name.startswith(_KEYSTORE_PREFIX)
+                    and entry.name.endswith(_KEYSTORE_SUFFIX)
+                ):
+                    keyfiles.append(entry.path)
+        if collect_files and keyfiles:
+            groups.append((fee_recipient, path, keyfiles))
+        for entry in subdirs:
+            recipient = None
+            if entry.name.startswith("0x"):
+                try:
+                    if is_address(entry.name):
+                        recipient = entry.name
+                except ValueError:
+                    pass
+            _scan(entry.path, recipient, recipient is not None)
+
+    _scan(private_keys_dir, None, True)
+    return groups
+
+
+def _decrypt_keyfiles(
+    keyfiles: List[str],
+    password: str,
+    fee_recipient: Optional[str],
+    keypairs: List[Tuple[HexStr, DBKeyInfo]],
+    positions: Dict[HexStr, int],
+) -> Optional[str]:
+    """
+    Decrypts keystore files in parallel and adds the key pairs to keypairs.
+
+    The KDF inside keystore decryption is pure CPU, so the work is spread
+    over a process pool. Returns the first file that could not be
+    decrypted, or None when the whole batch succeeded.
+    """
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        with click.progressbar(
+            length=len(keyfiles),
+            label="Decrypting private keys:\t\t",
+            show_percent=False,
+            show_pos=True,
+        ) as bar:
+            for filename, public_key, secret_key in executor.map(
+                functools.partial(_decrypt_keystore, password=password),
+                keyfiles,
+                chunksize=8,
+            ):
+                if public_key is None:
+                    # map() has queued the whole directory; drop the
+                    # pending chunks so a wrong password fails after the
+                    # running batch instead of grinding every KDF
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return filename
+
+                index = positions.get(public_key)
+                if index is None:
+                    positions[public_key] = len(keypairs)
+                    keypairs.append((public_key, DBKeyInfo(secret_key, fee_recipient)))
+                else:
+                    # later occurrences win: the fee-recipient directories
+                    # are scanned after the top level, so an address-dir
+                    # copy of a key overrides the recipient-less one
+                    keypairs[index] = (public_key, DBKeyInfo(secret_key, fee_recipient))
+                bar.update(1)
+    return None
 
 
 @click.command(help="Synchronizes validator keystores in the database for web3signer")
@@ -49,103 +194,65 @@ def sync_db(
     private_keys_dir: str,
     table_name: str,
 ) -> None:
-    check_db_connection(db_url)
-
-    web3signer = Web3SignerManager(
-        validator_capacity=validator_capacity,
-    )
-
     database = Database(
         db_url=db_url,
         table_name=table_name,
     )
+    database.check_connection()
+
+    web3signer = Web3SignerManager(
+        validator_capacity=validator_capacity,
+    )
 
-    keypairs: Dict[HexStr, DBKeyInfo] = dict()
+    # insertion order drives validator_index assignment; positions maps
+    # each public key to its slot so a duplicate found later (in a
+    # fee-recipient directory) replaces the earlier entry in place
+    keypairs: List[Tuple[HexStr, DBKeyInfo]] = []
+    positions: Dict[HexStr, int] = {}
 
     click.secho("Decrypting private keys...", bold=True)
 
-    # Top-level dir, no specific fee recipient
-    fee_recipient = None
+    # The top-level dir holds keystores without a specific fee recipient;
+    # directories named after an Ethereum address encode one. Keystores in
+    # one deployment typically share a password, so prompt once and only
+    # ask again for a directory where that password fails.
     private_keys_dir = os.path.expanduser(private_keys_dir)
-    keyfiles = glob.glob(os.path.join(private_keys_dir, "keystore*.json"))
-    if keyfiles:
-        decrypt_key = click.prompt(
-            f"Enter the password to decrypt validators private keys in {private_keys_dir}",
-            type=click.STRING,
-            hide_input=True,
-        )
+    decrypt_key = None
+    for fee_recipient, dir_path, keyfiles in _collect_keystores(private_keys_dir):
+        if decrypt_key is None:
+            decrypt_key = click.prompt(
+                "Enter the password to decrypt validators private keys",
+                type=click.STRING,
+                hide_input=True,
+            )
 
-        with click.progressbar(
-            length=len(keyfiles),
-            label="Decrypting private keys:\t\t",
-            show_percent=False,
-            show_pos=True,
-        ) as bar:
-            for filename in keyfiles:
-                keystore = Keystore.from_file(filename)
-
-                try:
-                    secret_bytes = keystore.decrypt(decrypt_key)
-                except Exception:
-                    click.secho(
-                        f"Unable to decrypt {filename} with the provided password",
-                        bold=True,
-                        err=True,
-                        fg="red",
-                    )
-
-                    sys.exit("Password incorrect")
-
-                keypairs["0x" + keystore.pubkey] = DBKeyInfo(
-                    int.from_bytes(secret_bytes, "big"), fee_recipient
+        failed = _decrypt_keyfiles(
+            keyfiles, decrypt_key, fee_recipient, keypairs, positions
+        )
+        if failed is not None:
+            click.secho(
+                f"Unable to decrypt {failed} with the provided password",
+                bold=True,
+                err=True,
+                fg="red",
+            )
+            decrypt_key = click.prompt(
+                f"Enter the password to decrypt validators private keys in {dir_path}",
+                type=click.STRING,
+                hide_input=True,
+            )
+            failed = _decrypt_keyfiles(
+                keyfiles, decrypt_key, fee_recipient, keypairs, positions
+            )
+            if failed is not None:
+                click.secho(
+                    f"Unable to decrypt {failed} with the provided password",
+                    bold=True,
+                    err=True,
+                    fg="red",
                 )
-                bar.update(1)
 
-    # Look for directories that encode a specific fee recipient
-    for root, dirs, files in os.walk(private_keys_dir):
-        for dir_name in dirs:
-            if dir_name.startswith("0x"):
-                try:
-                    if is_address(dir_name):
-                        fee_recipient = dir_name
-                    else:
-                        continue
-                except ValueError:
-                    continue
-                dir_path = os.path.join(root, dir_name)
-                keyfiles = glob.glob(os.path.join(dir_path, "keystore*.json"))
-                if keyfiles:
-                    decrypt_key = click.prompt(
-                        f"Enter the password to decrypt validators private keys in {dir_path}",
-                        type=click.STRING,
-                        hide_input=True,
-                    )
-
-                    with click.progressbar(
-                        length=len(keyfiles),
-                        label="Decrypting private keys:\t\t",
-                        show_percent=False,
-                        show_pos=True,
-                    ) as bar:
-                        for filename in keyfiles:
-                            keystore = Keystore.from_file(filename)
-
-                            try:
-                                secret_bytes = keystore.decrypt(decrypt_key)
-                            except Exception:
-                                click.secho(
-                                    f"Unable to decrypt {filename} with the provided password",
-                                    bold=True,
-                                    err=True,
-                                    fg="red",
-                                )
-
-                                sys.exit("Password incorrect")
-
-                            keypairs["0x" + keystore.pubkey] = DBKeyInfo(
-                                int.from_bytes(secret_bytes, "big"), fee_recipient
-                            )
-                            bar.update(1)
+                sys.exit("Password incorrect")
 
     click.confirm(
         f"Found {len(keypairs)} key pairs, apply changes to the database?",
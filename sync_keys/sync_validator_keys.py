@@ -1,3 +1,4 @@
+import hashlib
 import os
 import platform
 from os import mkdir
@@ -7,12 +8,16 @@ from typing import List, Optional, Tuple
 import click
 import yaml
 
-from database import Database, check_db_connection
+from database import Database
 from utils import is_lists_equal
 from validators import validate_db_uri, validate_env_name, validate_eth_address
 
+# libyaml's C parser when the PyYAML build provides it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 PUBLIC_KEYS_CSV_FILENAME = "validator_keys.csv"
 LIGHTHOUSE_CONFIG_FILENAME = "validator_definitions.yml"
+LIGHTHOUSE_DIGEST_FILENAME = "lighthouse.sha"
 SIGNER_CONFIG_FILENAME = "signer_keys.yml"
 SIGNER_PROPOSER_CONFIG_FILENAME = "proposerConfig.json"
 WEB3SIGNER_URL_ENV = "WEB3SIGNER_URL"
@@ -64,17 +69,34 @@ def sync_validator_keys(
     hostname = platform.node().split(".")[0]
     index = hostname.split("-")[-1]
 
-    check_db_connection(db_url)
-
     database = Database(db_url=db_url, table_name=table_name)
+    database.check_connection()
     keys = database.fetch_public_keys_by_validator_index(validator_index=index)
 
     if not exists(output_dir):
         mkdir(output_dir)
 
-    # check current public keys CSV
+    # check the digest of the previous sync first: a matching fingerprint
+    # skips the YAML parse entirely on no-op restarts. The digest covers
+    # the signer url too, so rotating WEB3SIGNER_URL forces a rewrite
+    web3signer_url = os.environ[web3signer_url_env]
+    digest = _keys_digest(keys, web3signer_url, default_recipient)
+    digest_filename = join(output_dir, LIGHTHOUSE_DIGEST_FILENAME)
     lighthouse_filename = join(output_dir, LIGHTHOUSE_CONFIG_FILENAME)
-    if exists(lighthouse_filename):
+    signer_filename = join(output_dir, SIGNER_CONFIG_FILENAME)
+    if exists(digest_filename):
+        # only trust the digest while the configs it describes are present
+        if exists(lighthouse_filename) and exists(signer_filename):
+            with open(digest_filename) as f:
+                if f.read().strip() == digest:
+                    click.secho(
+                        "Keys already synced to the last version.\n",
+                        bold=True,
+                        fg="green",
+                    )
+                    return
+    elif exists(lighthouse_filename):
+        # config written before digests existed - fall back to parsing it
         with open(lighthouse_filename) as f:
             current_keys = _load_lighthouse_config(f)
         if is_lists_equal(keys, current_keys):
@@ -86,21 +108,21 @@ def sync_validator_keys(
             return
 
     # save lighthouse config
-    web3signer_url = os.environ[web3signer_url_env]
     lighthouse_config = _generate_lighthouse_config(
         public_keys_with_recipient=keys,
         web3signer_url=web3signer_url,
         default_recipient=default_recipient,
     )
-    with open(join(output_dir, LIGHTHOUSE_CONFIG_FILENAME), "w") as f:
-        f.write(lighthouse_config)
+    _write_atomic(lighthouse_filename, lighthouse_config)
 
     # save teku/prysm config
     signer_keys_config = _generate_signer_keys_config(
         public_keys_with_recipient=keys, default_recipient=default_recipient
     )
-    with open(join(output_dir, SIGNER_CONFIG_FILENAME), "w") as f:
-        f.write(signer_keys_config)
+    _write_atomic(signer_filename, signer_keys_config)
+
+    # record the digest last so a crash mid-write forces a resync
+    _write_atomic(digest_filename, digest)
 
     click.secho(
         f"The validator now uses {len(keys)} public keys.\n",
@@ -109,6 +131,32 @@ def sync_validator_keys(
     )
 
 
+def _keys_digest(
+    public_keys_with_recipient: List[Tuple[str, Optional[str]]],
+    web3signer_url: str,
+    default_recipient: str,
+) -> str:
+    """
+    Fingerprint of the desired validator configuration
+    """
+    lines = [web3signer_url.encode()]
+    lines.extend(
+        f"{public_key}|{fee_recipient or default_recipient}".encode()
+        for public_key, fee_recipient in public_keys_with_recipient
+    )
+    return hashlib.blake2b(b"\n".join(lines), digest_size=16).hexdigest()
+
+
+def _write_atomic(filename: str, content: str) -> None:
+    """
+    Writes content through a temporary file and renames it into place
+    """
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w") as f:
+        f.write(content)
+    os.replace(tmp_filename, filename)
+
+
 def _generate_lighthouse_config(
     public_keys_with_recipient: List[Tuple[str, Optional[str]]],
     web3signer_url: str,
@@ -116,22 +164,25 @@ def _generate_lighthouse_config(
 ) -> str:
     """
     Generate config for Lighthouse clients
+
+    The document shape is fixed (five known keys, string values), so the
+    YAML is emitted directly instead of going through yaml.dump. Values
+    land in single-quoted scalars, where a literal quote is doubled.
     """
-    items = []
+    url = web3signer_url.replace("'", "''")
+    lines = ["---\n"]
     for public_key, fee_recipient in public_keys_with_recipient:
-        items.append(
-            {
-                "enabled": True,
-                "voting_public_key": public_key,
-                "type": "web3signer",
-                "url": web3signer_url,
-                "suggested_fee_recipient": (
-                    fee_recipient if fee_recipient is not None else default_recipient
-                ),
-            }
+        recipient = fee_recipient if fee_recipient is not None else default_recipient
+        recipient = recipient.replace("'", "''")
+        public_key = public_key.replace("'", "''")
+        lines.append(
+            f"- enabled: true\n"
+            f"  suggested_fee_recipient: '{recipient}'\n"
+            f"  type: web3signer\n"
+            f"  url: '{url}'\n"
+            f"  voting_public_key: '{public_key}'\n"
         )
-
-    return yaml.dump(items, explicit_start=True)
+    return "".join(lines)
 
 
 def _load_lighthouse_config(file) -> List[str]:
@@ -139,7 +190,7 @@ def _load_lighthouse_config(file) -> List[str]:
     Load config for Lighthouse clients
     """
     try:
-        items = yaml.safe_load(file)
+        items = yaml.load(file, Loader=_YAML_LOADER)
         return [item.get("voting_public_key") for item in items]
     except yaml.YAMLError:
         return []
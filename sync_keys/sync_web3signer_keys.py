@@ -9,7 +9,7 @@ import yaml
 from web3 import Web3
 
 from encoder import Decoder
-from database import Database, check_db_connection
+from database import Database
 from utils import is_lists_equal
 from validators import validate_db_uri, validate_env_name
 
@@ -48,9 +48,8 @@ def sync_web3signer_keys(
     The command is running by the init container in web3signer pods.
     Fetch and decrypt keys for web3signer and store them as keypairs in the output_dir.
     """
-    check_db_connection(db_url)
-
     database = Database(db_url=db_url, table_name=table_name)
+    database.check_connection()
     keys_records = database.fetch_keys()
 
     # decrypt private keys
@@ -59,8 +58,12 @@ def sync_web3signer_keys(
     private_keys: List[str] = []
     for key_record in keys_records:
         key = decoder.decrypt(data=key_record["private_key"], nonce=key_record["nonce"])
-        hex = Web3.to_hex(int(key))
-        private_keys.append(f"0x{hex[2:].zfill(64)}")  # pad missing leading zeros
+        if key.startswith("0x"):
+            private_keys.append(f"0x{key[2:].zfill(64)}")  # pad missing leading zeros
+        else:
+            # legacy records stored the key as a decimal string
+            hex = Web3.to_hex(int(key))
+            private_keys.append(f"0x{hex[2:].zfill(64)}")
 
     if not exists(output_dir):
         mkdir(output_dir)
@@ -9,7 +9,7 @@ Gwei = NewType("Gwei", int)
 
 
 class DBKeyInfo(NamedTuple):
-    secret_key: int
+    secret_key: HexStr
     fee_recipient: Optional[str]
 
 
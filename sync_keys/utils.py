@@ -1,15 +1,34 @@
-import collections
-from base64 import b64decode, b64encode
+from binascii import a2b_base64, b2a_base64
 from typing import List
 
 
 def is_lists_equal(x: List, y: List) -> bool:
-    return collections.Counter(x) == collections.Counter(y)
+    if len(x) != len(y):
+        return False
+    if len(x) < 100:
+        # small lists: two C-level sorts beat building two Counters
+        try:
+            return sorted(x) == sorted(y)
+        except TypeError:
+            # unorderable elements (e.g. None next to str), fall through
+            pass
+    # single pass with early exit on the first mismatch, instead of
+    # building and comparing two full Counters
+    counts = {}
+    for item in x:
+        counts[item] = counts.get(item, 0) + 1
+    for item in y:
+        count = counts.get(item, 0)
+        if count == 0:
+            return False
+        counts[item] = count - 1
+    return True
 
 
 def bytes_to_str(value: bytes) -> str:
-    return b64encode(value).decode("ascii")
+    # binascii directly: base64.b64encode is a thin wrapper around it
+    return b2a_base64(value, newline=False).decode("ascii")
 
 
 def str_to_bytes(value: str) -> bytes:
-    return b64decode(value)
+    return a2b_base64(value)
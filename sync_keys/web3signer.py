@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import List, Tuple
 
 import click
 from eth_typing import HexStr
@@ -17,14 +17,16 @@ class Web3SignerManager:
         self.encoder = Encoder()
 
     def process_transferred_keypairs(
-        self, keypairs: Dict[HexStr, DBKeyInfo]
+        self, keypairs: List[Tuple[HexStr, DBKeyInfo]]
     ) -> List[DatabaseKeyRecord]:
         """
         Returns prepared database key records from the transferred private keys.
         """
 
         key_records: List[DatabaseKeyRecord] = list()
-        index = 0
+        # running counters replace a floor division per key
+        validator_index = 0
+        keys_in_validator = 0
 
         with click.progressbar(
             length=len(keypairs),
@@ -32,18 +34,24 @@ class Web3SignerManager:
             show_percent=False,
             show_pos=True,
         ) as bar:
-            for public_key, (private_key, fee_recipient) in keypairs.items():
-                encrypted_private_key, nonce = self.encoder.encrypt(str(private_key))
-
+            encrypted_keys = self.encoder.encrypt_many(
+                info.secret_key for _, info in keypairs
+            )
+            for (public_key, (_, fee_recipient)), (encrypted_private_key, nonce) in zip(
+                keypairs, encrypted_keys
+            ):
                 key_record = DatabaseKeyRecord(
                     public_key=public_key,
                     private_key=bytes_to_str(encrypted_private_key),
                     nonce=bytes_to_str(nonce),
-                    validator_index=index // self.validator_capacity,
+                    validator_index=validator_index,
                     fee_recipient=fee_recipient,
                 )
                 key_records.append(key_record)
-                index += 1
+                keys_in_validator += 1
+                if keys_in_validator == self.validator_capacity:
+                    validator_index += 1
+                    keys_in_validator = 0
                 bar.update(1)
 
         return key_records
@@ -0,0 +1,119 @@
+import psycopg2
+
+from tests.conftest import assert_sql_contains, assert_sql_lacks
+from typings import DatabaseKeyRecord
+
+
+class TestFetchPublicKeysByValidatorIndex:
+    def test_queries_default_table(
+        self, patched_db_connection, mock_cursor, default_db
+    ):
+        """fetch_public_keys_by_validator_index should query default 'keys' table."""
+        mock_cursor.fetchall.return_value = [("0xpubkey1", "0xfee1")]
+
+        default_db.fetch_public_keys_by_validator_index(validator_index="0")
+
+        # A single SELECT, no information_schema probe
+        assert len(mock_cursor.execute.call_args_list) == 1
+        assert_sql_contains(
+            mock_cursor.execute, "identifier('keys')", "fee_recipient"
+        )
+
+    def test_queries_custom_table(
+        self, patched_db_connection, mock_cursor, make_db
+    ):
+        """fetch_public_keys_by_validator_index should query custom table."""
+        mock_cursor.fetchall.return_value = [("0xpubkey1", "0xfee1")]
+
+        make_db("custom_keys").fetch_public_keys_by_validator_index(
+            validator_index="0"
+        )
+
+        calls = mock_cursor.execute.call_args_list
+        assert len(calls) == 1
+        assert_sql_contains(mock_cursor.execute, "identifier('custom_keys')")
+        assert calls[0][0][1] == ("0",)
+
+    def test_queries_table_without_fee_recipient_column(
+        self, patched_db_connection, mock_cursor, make_db
+    ):
+        """Should handle legacy tables without fee_recipient column."""
+        # The first SELECT hits the missing column; the fallback succeeds
+        mock_cursor.execute.side_effect = [psycopg2.errors.UndefinedColumn(), None]
+        mock_cursor.fetchall.return_value = [("0xpubkey1", None)]
+
+        db = make_db("legacy_keys")
+        db.fetch_public_keys_by_validator_index(validator_index="0")
+
+        assert_sql_contains(
+            mock_cursor.execute,
+            "identifier('legacy_keys')",
+            "null as fee_recipient",
+            call_index=1,
+        )
+        # The outcome is memoized: the next call goes straight to the fallback
+        mock_cursor.execute.side_effect = None
+        db.fetch_public_keys_by_validator_index(validator_index="0")
+        assert_sql_contains(mock_cursor.execute, "null as fee_recipient")
+
+
+class TestFetchKeys:
+    def test_queries_default_table(
+        self, patched_db_connection, mock_cursor, default_db
+    ):
+        """fetch_keys should SELECT * FROM default 'keys' table."""
+        mock_cursor.fetchall.return_value = []
+
+        default_db.fetch_keys()
+
+        assert_sql_contains(
+            mock_cursor.execute,
+            "identifier('keys')",
+            "select public_key, private_key, nonce",
+        )
+
+    def test_queries_custom_table(
+        self, patched_db_connection, mock_cursor, make_db
+    ):
+        """fetch_keys should SELECT * FROM custom table."""
+        mock_cursor.fetchall.return_value = []
+
+        make_db("signer_keys").fetch_keys()
+
+        assert_sql_contains(
+            mock_cursor.execute,
+            "identifier('signer_keys')",
+            "select public_key, private_key, nonce",
+        )
+        # Should NOT contain default "keys" table
+        assert_sql_lacks(mock_cursor.execute, "identifier('keys')")
+
+    def test_returns_database_key_records(
+        self, patched_db_connection, mock_cursor, default_db
+    ):
+        """fetch_keys should return list of DatabaseKeyRecord."""
+        mock_cursor.__iter__.return_value = iter(
+            [
+                ("0xpub1", "enc_priv1", "nonce1", "0", "0xfee1"),
+                ("0xpub2", "enc_priv2", "nonce2", "1", None),
+            ]
+        )
+
+        result = default_db.fetch_keys()
+
+        assert result == [
+            DatabaseKeyRecord(
+                public_key="0xpub1",
+                private_key="enc_priv1",
+                nonce="nonce1",
+                validator_index="0",
+                fee_recipient="0xfee1",
+            ),
+            DatabaseKeyRecord(
+                public_key="0xpub2",
+                private_key="enc_priv2",
+                nonce="nonce2",
+                validator_index="1",
+                fee_recipient=None,
+            ),
+        ]
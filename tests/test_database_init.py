@@ -0,0 +1,8 @@
+class TestDatabaseInit:
+    def test_default_table_name(self, default_db):
+        """Database should use 'keys' as default table name."""
+        assert default_db.table_name == "keys"
+
+    def test_custom_table_name(self, make_db):
+        """Database should accept custom table name."""
+        assert make_db("custom_keys").table_name == "custom_keys"
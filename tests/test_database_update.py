@@ -0,0 +1,66 @@
+import database as database_module
+from tests.conftest import assert_sql_contains, assert_sql_lacks
+
+
+class TestUpdateKeys:
+    def test_creates_table_with_default_name(
+        self, patched_db_connection, mock_cursor, default_db
+    ):
+        """update_keys should CREATE TABLE with default 'keys' name."""
+        default_db.update_keys(keys=[])
+
+        # Check that the executed SQL contains the default table name
+        assert_sql_contains(
+            mock_cursor.execute,
+            "identifier('keys')",
+            "create table if not exists",
+            "add column if not exists fee_recipient",
+            "truncate",
+        )
+
+    def test_creates_table_with_custom_name(
+        self, patched_db_connection, mock_cursor, make_db
+    ):
+        """update_keys should CREATE TABLE with custom table name."""
+        make_db("validator_keys").update_keys(keys=[])
+
+        assert_sql_contains(
+            mock_cursor.execute,
+            "identifier('validator_keys')",
+            "create table if not exists",
+            "truncate",
+        )
+        # Should NOT contain default "keys" table
+        assert_sql_lacks(mock_cursor.execute, "identifier('keys')")
+
+    def test_inserts_to_custom_table(
+        self, patched_db_connection, mock_cursor, sample_key_records, make_db
+    ):
+        """update_keys should INSERT INTO custom table name."""
+        make_db("my_keys").update_keys(keys=sample_key_records)
+
+        # The insert should be a single parameterized unnest() statement
+        assert_sql_contains(
+            mock_cursor.execute, "insert into", "unnest", "identifier('my_keys')"
+        )
+        # Five parallel column arrays, one entry per record
+        arrays = mock_cursor.execute.call_args_list[-1][0][1]
+        assert len(arrays) == 5
+        assert all(len(column) == len(sample_key_records) for column in arrays)
+
+    def test_uses_copy_for_large_batches(
+        self, patched_db_connection, mock_cursor, sample_key_records, default_db
+    ):
+        """update_keys should stream large batches with COPY FROM STDIN."""
+        keys = [
+            dict(sample_key_records[0], public_key=f"0xabc{i}")
+            for i in range(database_module.COPY_MIN_ROWS)
+        ]
+        default_db.update_keys(keys=keys)
+
+        assert_sql_contains(mock_cursor.copy_expert, "copy", "from stdin")
+        # Buffer should contain one TSV line per record with \N for NULLs
+        buf = mock_cursor.copy_expert.call_args[0][1]
+        lines = buf.getvalue().splitlines()
+        assert len(lines) == len(keys)
+        assert lines[0].count("\t") == 4
@@ -1,12 +1,13 @@
+import pytest
+
 from encoder import Decoder, Encoder
 from utils import bytes_to_str
 
 
 class TestEncoder:
-    def test_encrypt_returns_encrypted_data_and_nonce(self):
-        encoder = Encoder()
+    def test_encrypt_returns_encrypted_data_and_nonce(self, shared_encoder):
         data = "12345678901234567890"
-        encrypted, nonce = encoder.encrypt(data)
+        encrypted, nonce = shared_encoder.encrypt(data)
 
         assert isinstance(encrypted, bytes)
         assert isinstance(nonce, bytes)
@@ -14,19 +15,17 @@ class TestEncoder:
         # Encrypted data should be different from original
         assert encrypted != data.encode("ascii")
 
-    def test_cipher_key_is_32_bytes(self):
-        encoder = Encoder()
-        assert len(encoder.cipher_key) == 32
+    def test_cipher_key_is_32_bytes(self, shared_encoder):
+        assert len(shared_encoder.cipher_key) == 32
 
-    def test_cipher_key_str_is_base64_encoded(self):
-        encoder = Encoder()
-        key_str = encoder.cipher_key_str
+    def test_cipher_key_str_is_base64_encoded(self, shared_encoder):
+        key_str = shared_encoder.cipher_key_str
         assert isinstance(key_str, str)
         # Should be decodable
         from utils import str_to_bytes
 
         decoded = str_to_bytes(key_str)
-        assert decoded == encoder.cipher_key
+        assert decoded == shared_encoder.cipher_key
 
     def test_generates_unique_nonces(self):
         encoder = Encoder()
@@ -36,54 +35,63 @@ class TestEncoder:
         # Each encryption should have a unique nonce
         assert nonce1 != nonce2
 
-    def test_cipher_key_is_cached(self):
-        encoder = Encoder()
-        key1 = encoder.cipher_key
-        key2 = encoder.cipher_key
+    def test_cipher_key_is_cached(self, shared_encoder):
+        key1 = shared_encoder.cipher_key
+        key2 = shared_encoder.cipher_key
         assert key1 is key2
 
+    def test_encrypt_many_roundtrip(self, shared_encoder):
+        decoder = Decoder(shared_encoder.cipher_key_str)
+        originals = ["secret one", "secret two", "secret three"]
 
-class TestDecoder:
-    def test_decrypt_returns_original_data(self):
-        encoder = Encoder()
-        original = "secret private key 12345"
-        encrypted, nonce = encoder.encrypt(original)
+        results = list(shared_encoder.encrypt_many(originals))
 
-        decoder = Decoder(encoder.cipher_key_str)
-        decrypted = decoder.decrypt(
-            data=bytes_to_str(encrypted), nonce=bytes_to_str(nonce)
-        )
+        assert len(results) == len(originals)
+        nonces = [nonce for _, nonce in results]
+        assert len(set(nonces)) == len(nonces)  # unique nonce per value
+        for original, (encrypted, nonce) in zip(originals, results):
+            decrypted = decoder.decrypt(
+                data=bytes_to_str(encrypted), nonce=bytes_to_str(nonce)
+            )
+            assert decrypted == original
 
-        assert decrypted == original
 
-    def test_encrypt_decrypt_roundtrip_with_numeric_string(self):
-        encoder = Encoder()
-        # Simulate a private key as numeric string
-        original = "12345678901234567890123456789012345678901234567890"
-        encrypted, nonce = encoder.encrypt(original)
+@pytest.fixture(scope="module")
+def shared_decoder(shared_encoder):
+    return Decoder(shared_encoder.cipher_key_str)
 
-        decoder = Decoder(encoder.cipher_key_str)
-        decrypted = decoder.decrypt(
+
+class TestDecoder:
+    @pytest.mark.parametrize(
+        "original",
+        [
+            "secret private key 12345",
+            # Simulate a private key as numeric string
+            "12345678901234567890123456789012345678901234567890",
+        ],
+    )
+    def test_decrypt_returns_original_data(
+        self, shared_encoder, shared_decoder, original
+    ):
+        encrypted, nonce = shared_encoder.encrypt(original)
+
+        decrypted = shared_decoder.decrypt(
             data=bytes_to_str(encrypted), nonce=bytes_to_str(nonce)
         )
 
         assert decrypted == original
 
-    def test_decrypt_with_wrong_key_fails(self):
+    def test_decrypt_with_wrong_key_fails(self, det_rng):
+        # det_rng gives the two encoders distinct keys without entropy
         encoder1 = Encoder()
         encoder2 = Encoder()
 
-        original = "secret data"
+        # Long enough that wrong-key output decoding as ascii by chance
+        # is negligible (one byte in two decodes, 2^-64 over 64 bytes)
+        original = "secret data that is long enough to make false positives moot"
         encrypted, nonce = encoder1.encrypt(original)
 
         decoder = Decoder(encoder2.cipher_key_str)
-        # Decryption with wrong key should fail or produce garbage
-        try:
-            result = decoder.decrypt(
-                data=bytes_to_str(encrypted), nonce=bytes_to_str(nonce)
-            )
-            # If it doesn't raise, the result should be different
-            assert result != original
-        except Exception:
-            # Expected - decryption should fail with wrong key
-            pass
+        # Wrong-key plaintext is random bytes, which fail the ascii decode
+        with pytest.raises(ValueError):
+            decoder.decrypt(data=bytes_to_str(encrypted), nonce=bytes_to_str(nonce))